@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from playwright.async_api import async_playwright
+from ai_job_agent import add_profile_arguments, agent_from_args
+from run_journal import DAEMON_JOURNAL_FILE
+from user_profile import profile_key
+
+STATUS_FILE = "agent_status.json"
+DEFAULT_INTERVAL = 600  # seconds between polls
+DEFAULT_JITTER = 120  # +/- seconds added to each interval
+MAX_JOB_ATTEMPTS = 3  # polls a failing job is retried on before it is given up
+# Ids the daemon has finished with (applied, skipped or given up), kept across restarts per profile
+SEEN_JOBS_FILE = "agent_seen_jobs.{run_key}.json"
+
+
+class AgentDaemon:
+    """
+    Keeps the models, browser context and caches resident and polls Shufti search on a schedule,
+    processing only listings it has not seen before.
+    """
+
+    def __init__(self, agent, interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER, status_file=STATUS_FILE,
+                 log_callback=print, seen_jobs_file=SEEN_JOBS_FILE):
+        self.agent = agent
+        self.scraper = agent.session.scraper
+        self.interval = interval
+        self.jitter = jitter
+        self.status_file = status_file
+        self.log_callback = log_callback
+        self.seen_jobs_file = seen_jobs_file.format(run_key=profile_key(agent.user_profile))
+        self.seen_jobs = self.load_seen_jobs() | set(agent.applied_jobs)
+        if agent.applied_record is not None:
+            self.seen_jobs |= agent.applied_record.applied_ids()
+        self.job_attempts = {}
+        self.stats = {
+            "state": "starting",
+            "pid": os.getpid(),
+            "started_at": time.time(),
+            "cycles": 0,
+            "last_poll_at": None,
+            "last_poll_seconds": None,
+            "next_poll_at": None,
+            "jobs_processed": 0,
+            "jobs_applied": 0,
+            "errors": 0,
+            "last_error": None,
+        }
+
+    def write_status(self, state=None):
+        """
+        Atomically writes the health/throughput stats to the status file.
+        """
+        if state:
+            self.stats["state"] = state
+        uptime_hours = max(time.time() - self.stats["started_at"], 1) / 3600
+        self.stats["jobs_processed_per_hour"] = round(self.stats["jobs_processed"] / uptime_hours, 2)
+        tmp_file = f"{self.status_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(tmp_file, self.status_file)
+
+    def load_seen_jobs(self):
+        try:
+            with open(self.seen_jobs_file, "r") as f:
+                return set(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return set()
+
+    def save_seen_jobs(self):
+        tmp_file = f"{self.seen_jobs_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(sorted(self.seen_jobs), f)
+        os.replace(tmp_file, self.seen_jobs_file)
+
+    def next_delay(self):
+        return max(0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    async def poll_once(self, context, page):
+        started = time.time()
+        self.write_status("polling")
+
+        await self.scraper.ensure_logged_in(context, page)
+        jobs = await self.scraper.fetch_jobs(page, self.agent.user_profile, skip_ids=self.seen_jobs)
+        self.log_callback(f"[POLL] {len(jobs)} new listings found.\n")
+
+        journal = self.agent.session.journal
+        try:
+            for job in jobs:
+                applied_before = len(self.agent.applied_jobs)
+                try:
+                    await self.agent.process_job(job, self.log_callback)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    self.stats["last_error"] = str(e)
+                    logging.error(f"Processing failed for job {job['id']}: {e}")
+                    self.log_callback(f"[ERROR] Job {job['id']}: {e}\n")
+
+                    attempts = self.job_attempts.get(job["id"], 0) + 1
+                    self.job_attempts[job["id"]] = attempts
+                    if attempts < MAX_JOB_ATTEMPTS:
+                        # Kept out of seen_jobs; its journaled stages let the next poll retry without refetching
+                        continue
+                    self.log_callback(f"[GIVING UP] Job {job['id']} failed {attempts} times.\n")
+                    journal.record(job["id"], "skipped", error=str(e))
+
+                self.job_attempts.pop(job["id"], None)
+                self.seen_jobs.add(job["id"])
+                self.stats["jobs_processed"] += 1
+                self.stats["jobs_applied"] += len(self.agent.applied_jobs) - applied_before
+        finally:
+            self.save_seen_jobs()
+
+        # Keep checkpoints while any job is waiting for a retry; every other job is already in seen_jobs
+        if not any(job["id"] in self.job_attempts for job in jobs):
+            journal.clear()
+        self.stats["last_poll_at"] = started
+        self.stats["last_poll_seconds"] = round(time.time() - started, 2)
+
+    async def run(self, max_cycles=None):
+        async with async_playwright() as p:
+            browser = context = page = None
+            try:
+                while True:
+                    try:
+                        if page is None:
+                            browser, context, page = await self.scraper.open_browser(p)
+                        await self.poll_once(context, page)
+                    except Exception as e:
+                        self.stats["errors"] += 1
+                        self.stats["last_error"] = str(e)
+                        logging.error(f"Poll cycle failed: {e}")
+                        self.log_callback(f"[ERROR] Poll cycle failed: {e}\n")
+                        # Chromium or the context may have died; rebuild them from the saved session next cycle
+                        await self.scraper.close_browser(browser, context)
+                        browser = context = page = None
+                    self.stats["cycles"] += 1
+                    if max_cycles is not None and self.stats["cycles"] >= max_cycles:
+                        break
+
+                    delay = self.next_delay()
+                    self.stats["next_poll_at"] = time.time() + delay
+                    self.write_status("sleeping")
+                    self.log_callback(f"[SLEEP] Next poll in {delay:.0f}s.\n")
+                    await asyncio.sleep(delay)
+            finally:
+                self.write_status("stopped")
+                await self.scraper.close_browser(browser, context)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the AI job agent as a long-running polling daemon.")
+    add_profile_arguments(parser)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between polls.")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Random +/- seconds per poll.")
+    parser.add_argument("--status-file", default=STATUS_FILE)
+    parser.add_argument("--max-cycles", type=int, default=None, help="Stop after this many polls.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    agent = agent_from_args(args, journal_file=DAEMON_JOURNAL_FILE)
+    daemon = AgentDaemon(agent, interval=args.interval, jitter=args.jitter, status_file=args.status_file,
+                         log_callback=lambda message: print(message, end=""))
+
+    try:
+        asyncio.run(daemon.run(max_cycles=args.max_cycles))
+    except KeyboardInterrupt:
+        print("[INFO] Daemon stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import asyncio
+import getpass
 import json
 import logging
-from bs4 import BeautifulSoup
+import os
 from selenium import webdriver
 from webdriver_manager.chrome import ChromeDriverManager
 from shufti_session import ShuftiSession
@@ -10,6 +11,10 @@ from job_filter import is_relevant_job
 from form_filler import fill_and_submit_form
 from field_mapper import identify_field_and_fill
 from job_scoring import score_job_relevance
+from html_extractor import parse_form_page, extract_labeled_fields
+from run_journal import JOURNAL_FILE
+from job_queue import JobQueue, QUEUE_FILE
+from user_profile import get_user_profile
 
 APPLIED_JOBS_FILE = "applied_jobs.json"
 LOG_FILE = "application_log.txt"
@@ -28,8 +33,11 @@ def load_applied_jobs():
 
 
 def save_applied_jobs(applied_jobs):
-    with open(APPLIED_JOBS_FILE, "w") as f:
+    # Write to a temp file and swap it in so a crash mid-write never leaves a truncated record
+    tmp_file = f"{APPLIED_JOBS_FILE}.tmp"
+    with open(tmp_file, "w") as f:
         json.dump(applied_jobs, f)
+    os.replace(tmp_file, APPLIED_JOBS_FILE)
 
 
 def log_application_status(job_id, success):
@@ -48,14 +56,11 @@ def initialize_webdriver():
     return webdriver.Chrome(ChromeDriverManager().install(), options=options)
 
 
-def extract_form_data(driver, user_profile):
+def extract_form_data(driver, user_profile, page=None):
     form_data = {}
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    page = page or parse_form_page(driver.page_source)
 
-    for label in soup.find_all("label"):
-        label_text = label.get_text(strip=True)
-        placeholder = label.find_next("input") or label.find_next("textarea")
-        placeholder_text = placeholder.get("placeholder") if placeholder else None
+    for label_text, placeholder_text in extract_labeled_fields(page):
         value = identify_field_and_fill(label_text, placeholder_text, user_data=user_profile)
 
         if value:
@@ -74,13 +79,14 @@ def attempt_form_submission(job_url, user_profile):
         driver = initialize_webdriver()
         driver.get(job_url)
 
-        form_data = extract_form_data(driver, user_profile)
+        page = parse_form_page(driver.page_source)
+        form_data = extract_form_data(driver, user_profile, page=page)
 
         if not form_data:
             logging.error("[ERROR] Failed to extract form data.")
             return
 
-        fill_and_submit_form(driver, form_data)
+        fill_and_submit_form(driver, form_data, page=page)
         logging.info("[FORM FILLED] Form filled and submitted.")
     except Exception as e:
         logging.error(f"Form submission failed for {job_url}: {e}")
@@ -90,7 +96,7 @@ def attempt_form_submission(job_url, user_profile):
 
 class AIJobAgent:
     def __init__(self, user_session, user_name="Your AI Agent", user_email=None, user_skills=None,
-                 user_bio="No bio provided."):
+                 user_bio="No bio provided.", applied_record=None):
         self.session = user_session
         self.user_name = user_name
         self.user_email = user_email
@@ -102,37 +108,54 @@ class AIJobAgent:
             "skills": self.user_skills,
             "bio": self.user_bio
         }
+        # Shared record (e.g. the JobQueue database) used instead of applied_jobs.json when
+        # several processes apply at once; it must provide is_applied(), mark_applied() and unmark_applied()
+        self.applied_record = applied_record
         self.applied_jobs = load_applied_jobs()
 
-    async def process_job(self, job, log_callback):
-        job_id = job.get("id")
-        if not job_id or job_id in self.applied_jobs:
-            return
-
-        logging.debug(f"[DEBUG] Job data: {job}")
-
-        # Score relevance
-        score = score_job_relevance(
-            job["title"],
-            job["description"],
-            job.get("requirements", ""),
-            user_profile=self.user_profile
-        )
-
-        log_callback(f"[RELEVANCE SCORE] Job {job_id} scored {score:.2f}\n")
+    def is_applied(self, job_id):
+        if self.applied_record is not None and self.applied_record.is_applied(job_id):
+            return True
+        return job_id in self.applied_jobs
+
+    def reserve_application(self, job_id):
+        """
+        Claims the job in the shared applied record before anything is sent, so another process
+        (e.g. a worker that picked the job up after this one's lease expired) cannot apply to it again.
+        """
+        if self.applied_record is None:
+            return True
+        return self.applied_record.mark_applied(job_id)
+
+    def release_application(self, job_id):
+        if self.applied_record is not None:
+            self.applied_record.unmark_applied(job_id)
+
+    def record_applied(self, job_id):
+        """
+        Records a job as applied; safe to call again for a job resumed from the run journal.
+        """
+        if self.applied_record is not None:
+            self.applied_record.mark_applied(job_id)
+            if job_id not in self.applied_jobs:
+                self.applied_jobs.append(job_id)
+        elif job_id not in self.applied_jobs:
+            self.applied_jobs.append(job_id)
+            save_applied_jobs(self.applied_jobs)
+        self.session.journal.record(job_id, "applied")
 
-        if not is_relevant_job(job, self.user_profile):
-            log_callback(f"[SKIPPED] Job {job_id} deemed irrelevant.\n")
-            return
+    def apply_to_job(self, job, log_callback):
+        """
+        Sends the application through the job's form or as a message. Returns True on success.
+        """
+        job_id = job["id"]
 
         # Form-based application detection
         if any(kw in job["description"].lower() for kw in ["fill out", "application form", "submit your info"]):
             logging.debug(f"[DEBUG] Attempting form submission for {job_id}")
             attempt_form_submission(job["link"], self.user_profile)
             log_callback(f"[FORM SUBMITTED] Job {job_id}\n")
-            self.applied_jobs.append(job_id)
-            save_applied_jobs(self.applied_jobs)
-            return
+            return True
 
         # Message-based application
         message = generate_application_message(
@@ -142,14 +165,59 @@ class AIJobAgent:
             user_profile=self.user_profile
         )
 
-        success = self.session.messaging_agent.send_message(job_id, message)
+        success = self.session.messaging_agent.send_message(
+            job_id,
+            job["title"],
+            job["description"],
+            job.get("requirements", ""),
+            message=message
+        )
         if success:
-            self.applied_jobs.append(job_id)
-            save_applied_jobs(self.applied_jobs)
             log_callback(f"[SUCCESS] Applied to job {job_id}\n")
         else:
             log_callback(f"[FAILURE] Failed to apply to job {job_id}\n")
         log_application_status(job_id, success)
+        return success
+
+    async def process_job(self, job, log_callback):
+        job_id = job.get("id")
+        if not job_id or self.is_applied(job_id) or self.session.journal.is_done(job_id):
+            return
+
+        logging.debug(f"[DEBUG] Job data: {job}")
+
+        # Score relevance (already computed and journaled by the scraper when available)
+        score = job.get("score")
+        if score is None:
+            score = score_job_relevance(
+                job["title"],
+                job["description"],
+                job.get("requirements", ""),
+                user_profile=self.user_profile
+            )
+
+        log_callback(f"[RELEVANCE SCORE] Job {job_id} scored {score:.2f}\n")
+
+        if not is_relevant_job(job, self.user_profile, score=score):
+            self.session.journal.record(job_id, "skipped")
+            log_callback(f"[SKIPPED] Job {job_id} deemed irrelevant.\n")
+            return
+
+        if not self.reserve_application(job_id):
+            self.session.journal.record(job_id, "skipped")
+            log_callback(f"[SKIPPED] Job {job_id} was already applied to by another process.\n")
+            return
+
+        try:
+            success = self.apply_to_job(job, log_callback)
+        except Exception:
+            self.release_application(job_id)
+            raise
+
+        if success:
+            self.record_applied(job_id)
+        else:
+            self.release_application(job_id)
 
     async def run(self, log_callback):
         jobs = await self.session.scraper.crawl_jobs(user_profile=self.user_profile)
@@ -160,15 +228,44 @@ class AIJobAgent:
 
         await asyncio.gather(*tasks)
 
+        # Every job reached a final stage, so there is nothing left to resume
+        self.session.journal.clear()
+
+
+def create_agent(email, password, name, skills, bio, journal_file=JOURNAL_FILE, applied_record=None):
+    """
+    Builds the session and agent for one user profile.
+    journal_file=None keeps the run journal in memory only.
+    """
+    if applied_record is None and os.path.exists(QUEUE_FILE):
+        # Coordinator/workers share this directory; use their applied record so no two processes apply twice
+        applied_record = JobQueue(QUEUE_FILE)
+    user_profile = get_user_profile(email, name, skills, bio)
+    session = ShuftiSession(email, password, user_name=name, user_profile=user_profile, journal_file=journal_file)
+    return AIJobAgent(session, user_name=name, user_email=email, user_skills=skills, user_bio=bio,
+                      applied_record=applied_record)
+
+
+def add_profile_arguments(parser):
+    """
+    Adds the account/profile options shared by the command line entry points.
+    """
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--skills", default="", help="Comma separated list of skills.")
+    parser.add_argument("--bio", required=True)
+
+
+def agent_from_args(args, **kwargs):
+    """
+    Builds an agent from parsed profile options, reading the password from SHUFTI_PASSWORD or a prompt.
+    """
+    password = os.environ.get("SHUFTI_PASSWORD") or getpass.getpass("Shufti password: ")
+    skills = [skill.strip() for skill in args.skills.split(",") if skill.strip()]
+    return create_agent(args.email, password, args.name, skills, args.bio, **kwargs)
+
 
 async def run_agent_with_name(email, password, name, skills, bio, log_callback=print):
-    user_profile = {
-        "name": name,
-        "email": email,
-        "skills": skills,
-        "bio": bio
-    }
-    session = ShuftiSession(email, password, user_name=name, user_profile=user_profile)
-    agent = AIJobAgent(session, user_name=name, user_email=email, user_skills=skills, user_bio=bio)
+    agent = create_agent(email, password, name, skills, bio)
     await agent.run(log_callback)
 
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark for the HTML extraction layer.
+
+Times the legacy full BeautifulSoup/html.parser extraction against html_extractor
+on saved Shufti pages. bench_pages/ holds synthetic stand-ins with the page structure
+the scraper targets; point the benchmark at a directory of real saved pages to compare.
+
+Usage:
+    python bench_html_extraction.py [pages_dir] [repeats]
+"""
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+import html_extractor
+
+
+def legacy_job_links(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [card["href"] for card in soup.find_all("a", class_="job-info-full-link")]
+
+
+def legacy_job_details(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.find("h1")
+    description = soup.find("div", class_="job-description")
+    requirements = soup.find("div", class_="job-requirements")
+    return {
+        "title": title.get_text(strip=True) if title else "No Title Found",
+        "description": description.get_text(strip=True) if description else "No Description Found",
+        "requirements": requirements.get_text(strip=True) if requirements else "No Requirements Found",
+    }
+
+
+def time_per_page(func, pages, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for html in pages:
+            func(html)
+    return (time.perf_counter() - start) / (repeats * len(pages)) * 1000
+
+
+def main():
+    pages_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / "bench_pages"
+    if not pages_dir.is_dir():
+        print(__doc__)
+        sys.exit(1)
+
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    search_pages, detail_pages = [], []
+    for path in sorted(pages_dir.glob("*.htm*")):
+        html = path.read_text(encoding="utf-8")
+        (search_pages if "job-info-full-link" in html else detail_pages).append(html)
+
+    print(f"[BENCH] backend={html_extractor.BACKEND} search_pages={len(search_pages)} "
+          f"detail_pages={len(detail_pages)} repeats={repeats}")
+
+    stages = [
+        ("search", search_pages, legacy_job_links, html_extractor.extract_job_links),
+        ("detail", detail_pages, legacy_job_details, html_extractor.extract_job_details),
+    ]
+    for name, pages, legacy, current in stages:
+        if not pages:
+            continue
+        legacy_ms = time_per_page(legacy, pages, repeats)
+        current_ms = time_per_page(current, pages, repeats)
+        print(f"[{name.upper()}] legacy {legacy_ms:.2f} ms/page | "
+              f"{html_extractor.BACKEND} {current_ms:.2f} ms/page | "
+              f"speedup x{legacy_ms / current_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
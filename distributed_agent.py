@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+from playwright.async_api import async_playwright
+from ai_job_agent import add_profile_arguments, agent_from_args, load_applied_jobs
+from job_queue import JobQueue, QUEUE_FILE, VISIBILITY_TIMEOUT
+from job_scoring import score_job_relevance
+from run_journal import COORDINATOR_JOURNAL_FILE
+
+WORKER_POLL_INTERVAL = 5  # seconds an idle worker waits before checking the queue again
+
+
+async def run_coordinator(agent, queue, interval=0):
+    """
+    Crawls Shufti and pushes new listings onto the queue; translation, scoring and applying are left to workers.
+    Runs once, or keeps polling every `interval` seconds when it is positive; in that mode a failed crawl
+    is logged, the browser is rebuilt from the saved session and polling continues.
+    """
+    scraper = agent.session.scraper
+    async with async_playwright() as p:
+        browser = context = page = None
+        try:
+            while True:
+                try:
+                    if page is None:
+                        browser, context, page = await scraper.open_browser(p)
+                    await scraper.ensure_logged_in(context, page)
+                    skip_ids = queue.known_ids() | queue.applied_ids() | set(load_applied_jobs())
+                    jobs = await scraper.fetch_jobs(page, agent.user_profile, skip_ids=skip_ids, score=False)
+                    pushed = sum(queue.push(job) for job in jobs)
+                    scraper.journal.clear()
+                    print(f"[COORDINATOR] Queued {pushed} new jobs. Queue: {queue.stats()}")
+                except Exception as e:
+                    if interval <= 0:
+                        raise
+                    logging.error(f"Coordinator crawl failed: {e}")
+                    print(f"[ERROR] Crawl failed: {e}")
+                    await scraper.close_browser(browser, context)
+                    browser = context = page = None
+
+                if interval <= 0:
+                    break
+                await asyncio.sleep(interval)
+        finally:
+            await scraper.close_browser(browser, context)
+
+
+async def run_worker(agent, queue, worker_id, exit_when_empty=False):
+    """
+    Claims jobs from the queue, scores them and applies, acking each job once it is handled.
+    A worker that crashes mid-job leaves its lease to expire so another worker picks the job up;
+    the application itself is reserved in the shared applied record first, so it is never sent twice.
+    """
+    log_callback = lambda message: print(f"[{worker_id}] {message}", end="")
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            if exit_when_empty:
+                break
+            await asyncio.sleep(WORKER_POLL_INTERVAL)
+            continue
+
+        try:
+            # Dedup against the shared applied record and the single-process applied_jobs.json
+            agent.applied_jobs = load_applied_jobs()
+            if not agent.is_applied(job["id"]):
+                job["score"] = score_job_relevance(
+                    job["title"], job["description"], job["requirements"], agent.user_profile
+                )
+                # Renew the lease after the slow scoring step; if it was lost another worker owns the job now
+                if not queue.extend_lease(job["id"], worker_id):
+                    log_callback(f"[LEASE LOST] Job {job['id']} was reclaimed by another worker.\n")
+                    continue
+                await agent.process_job(job, log_callback)
+            agent.session.journal.clear()
+            if not queue.ack(job["id"], worker_id):
+                logging.warning(f"Worker {worker_id} lost the lease on job {job['id']} before acking it.")
+                log_callback(f"[LEASE LOST] Job {job['id']} was handled but its lease had expired.\n")
+        except Exception as e:
+            logging.error(f"Worker {worker_id} failed on job {job['id']}: {e}")
+            log_callback(f"[ERROR] Job {job['id']}: {e}\n")
+            queue.fail(job["id"], worker_id, e)
+
+
+def parse_args():
+    profile = argparse.ArgumentParser(add_help=False)
+    add_profile_arguments(profile)
+    profile.add_argument("--queue-file", default=QUEUE_FILE)
+
+    parser = argparse.ArgumentParser(description="Run the AI job agent as a coordinator or a queue worker.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", parents=[profile], help="Crawl Shufti and queue new jobs.")
+    coordinator.add_argument("--interval", type=float, default=0,
+                             help="Seconds between crawls; 0 crawls once and exits.")
+
+    worker = commands.add_parser("worker", parents=[profile], help="Claim queued jobs, score them and apply.")
+    worker.add_argument("--visibility-timeout", type=float, default=VISIBILITY_TIMEOUT,
+                        help="Seconds before a claimed job is handed to another worker.")
+    worker.add_argument("--exit-when-empty", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    try:
+        if args.command == "coordinator":
+            queue = JobQueue(args.queue_file)
+            # Own journal file so clearing it never touches a GUI or daemon run's resumable state
+            agent = agent_from_args(args, journal_file=COORDINATOR_JOURNAL_FILE)
+            asyncio.run(run_coordinator(agent, queue, interval=args.interval))
+        else:
+            worker_id = f"{socket.gethostname()}-{os.getpid()}"
+            queue = JobQueue(args.queue_file, visibility_timeout=args.visibility_timeout)
+            # The queue lease already makes a worker's job resumable, so its journal stays in memory
+            agent = agent_from_args(args, journal_file=None, applied_record=queue)
+            print(f"[WORKER] {worker_id} started at {time.strftime('%Y-%m-%d %H:%M:%S')}.")
+            asyncio.run(run_worker(agent, queue, worker_id, exit_when_empty=args.exit_when_empty))
+    except KeyboardInterrupt:
+        print("[INFO] Stopped.")
+
+
+if __name__ == "__main__":
+    main()
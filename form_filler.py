@@ -1,6 +1,6 @@
-from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 import time
+from html_extractor import parse_form_page, extract_input_fields
 
 # ====== Keywords for Field Matching ======
 FIELD_KEYWORDS = {
@@ -13,20 +13,9 @@ FIELD_KEYWORDS = {
 SUBMIT_KEYWORDS = ['submit', '送信', '応募']
 
 
-def get_label_text(soup, input_tag):
-    """
-    Extracts label text associated with an input field, if any.
-    """
-    if input_tag.has_attr('id'):
-        label = soup.find('label', {'for': input_tag['id']})
-        if label:
-            return label.text.strip().lower()
-    return ''
-
-
 def find_input_element(driver, input_tag, placeholder):
     """
-    Tries to find a Selenium element from a BeautifulSoup input tag.
+    Tries to find a Selenium element from the attributes of an extracted input field.
     """
     try:
         if input_tag.get('name'):
@@ -38,22 +27,23 @@ def find_input_element(driver, input_tag, placeholder):
     return None
 
 
-def fill_and_submit_form(driver, form_data):
+def fill_and_submit_form(driver, form_data, page=None):
     """
     Fills out and submits a web form based on matching keywords.
 
     Args:
         driver: Selenium WebDriver instance
         form_data: Dictionary with fields like 'name', 'email', 'message', 'bio'
+        page: Optional ParsedPage of the form, reused instead of parsing page_source again
     """
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    page = page or parse_form_page(driver.page_source)
 
-    for input_tag in soup.find_all(['input', 'textarea']):
+    for input_tag in extract_input_fields(page):
         input_type = input_tag.get('type', '').lower()
         input_name = input_tag.get('name', '').lower()
         placeholder = input_tag.get('placeholder', '').lower()
         aria_label = input_tag.get('aria-label', '').lower()
-        label_text = get_label_text(soup, input_tag)
+        label_text = input_tag['label'].lower()
 
         combined_text = f"{input_name} {placeholder} {aria_label} {label_text}"
 
@@ -0,0 +1,172 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# ====== Backend Selection ======
+# Prefer selectolax (lexbor), then lxml + cssselect, then fall back to BeautifulSoup.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    BACKEND = "selectolax"
+except ImportError:
+    try:
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        BACKEND = "lxml"
+    except ImportError:
+        import soupsieve
+        from bs4 import BeautifulSoup, SoupStrainer
+        BACKEND = "bs4"
+
+# ====== Selectors ======
+JOB_LINK_SELECTOR = "a.job-info-full-link"
+JOB_TITLE_SELECTOR = "h1"
+JOB_DESCRIPTION_SELECTOR = "div.job-description"
+JOB_REQUIREMENTS_SELECTOR = "div.job-requirements"
+FORM_FIELD_SELECTOR = "label, input, textarea"
+
+# Tags each stage needs; only used to limit what the BeautifulSoup fallback builds.
+JOB_LIST_TAGS = ["a"]
+# Detail pages are mostly divs, so a strainer costs more in per-tag matching than it saves in tree building
+JOB_DETAIL_TAGS = None
+FORM_TAGS = ["label", "input", "textarea"]
+
+# Never part of visible text; BeautifulSoup's get_text already leaves them out
+NON_TEXT_TAGS = ["script", "style"]
+
+# text is stripped per text node and joined (like get_text(strip=True));
+# raw_text keeps the whitespace between child nodes (like .text)
+Node = namedtuple("Node", ["tag", "attrs", "text", "raw_text"])
+
+
+@lru_cache(maxsize=None)
+def _compile(selector):
+    """
+    Compiles a CSS selector once for the active backend.
+    selectolax has no compiled form, so the selector string is used as-is.
+    """
+    if BACKEND == "lxml":
+        return CSSSelector(selector)
+    if BACKEND == "bs4":
+        return soupsieve.compile(selector)
+    return selector
+
+
+class ParsedPage:
+    """
+    A single parse of an HTML page, shared by every extraction that needs it.
+    """
+
+    def __init__(self, html, only_tags=None):
+        html = html or "<html></html>"
+        if BACKEND == "selectolax":
+            self._tree = LexborHTMLParser(html)
+            self._tree.strip_tags(NON_TEXT_TAGS)
+        elif BACKEND == "lxml":
+            parser = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+            self._tree = lxml.html.fromstring(html.encode("utf-8"), parser=parser)
+            for el in list(self._tree.iter(*NON_TEXT_TAGS)):
+                el.drop_tree()
+        else:
+            parse_only = SoupStrainer(only_tags) if only_tags else None
+            self._tree = BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+    def select(self, selector):
+        """
+        Returns every element matching the selector, in document order, as Node tuples.
+        """
+        compiled = _compile(selector)
+        if BACKEND == "selectolax":
+            return [
+                Node(el.tag, {k: v or "" for k, v in el.attributes.items()},
+                     el.text(deep=True, separator="", strip=True), el.text(deep=True))
+                for el in self._tree.css(compiled)
+            ]
+        if BACKEND == "lxml":
+            return [
+                Node(el.tag, {k: v or "" for k, v in el.attrib.items()},
+                     "".join(s.strip() for s in el.itertext()), el.text_content())
+                for el in compiled(self._tree)
+            ]
+        return [
+            Node(el.name, {k: " ".join(v) if isinstance(v, list) else v for k, v in el.attrs.items()},
+                 el.get_text(strip=True), el.get_text())
+            for el in compiled.select(self._tree)
+        ]
+
+    def first_text(self, selector, default=""):
+        """
+        Returns the stripped text of the first matching element, or the default.
+        """
+        if BACKEND == "selectolax":
+            el = self._tree.css_first(selector)
+            return el.text(deep=True, separator="", strip=True) if el else default
+        if BACKEND == "bs4":
+            el = _compile(selector).select_one(self._tree)
+            return el.get_text(strip=True) if el else default
+        nodes = self.select(selector)
+        return nodes[0].text if nodes else default
+
+
+# ====== Stage Extractors ======
+def extract_job_links(html):
+    """
+    Returns the hrefs of all job cards on a search results page.
+    """
+    page = ParsedPage(html, only_tags=JOB_LIST_TAGS)
+    return [node.attrs["href"] for node in page.select(JOB_LINK_SELECTOR) if node.attrs.get("href")]
+
+
+def extract_job_details(html):
+    """
+    Returns the title, description and requirements text of a job detail page.
+    """
+    page = ParsedPage(html, only_tags=JOB_DETAIL_TAGS)
+    return {
+        "title": page.first_text(JOB_TITLE_SELECTOR, "No Title Found"),
+        "description": page.first_text(JOB_DESCRIPTION_SELECTOR, "No Description Found"),
+        "requirements": page.first_text(JOB_REQUIREMENTS_SELECTOR, "No Requirements Found"),
+    }
+
+
+def parse_form_page(html):
+    """
+    Parses an application form page once so it can be shared by form extraction and filling.
+    """
+    return ParsedPage(html, only_tags=FORM_TAGS)
+
+
+def extract_labeled_fields(page):
+    """
+    Pairs each label with the next input that follows it in the document,
+    or the next textarea when no input follows.
+
+    Returns:
+        list: (label_text, placeholder) tuples; placeholder is None if there is no following field.
+    """
+    nodes = page.select(FORM_FIELD_SELECTOR)
+    fields = []
+    for i, node in enumerate(nodes):
+        if node.tag != "label":
+            continue
+        following = (next((n for n in nodes[i + 1:] if n.tag == "input"), None)
+                     or next((n for n in nodes[i + 1:] if n.tag == "textarea"), None))
+        fields.append((node.text, following.attrs.get("placeholder") if following else None))
+    return fields
+
+
+def extract_input_fields(page):
+    """
+    Returns the attributes of every input/textarea, with the text of its <label for=...> added as 'label'.
+    """
+    nodes = page.select(FORM_FIELD_SELECTOR)
+    labels_by_id = {}
+    for node in nodes:
+        if node.tag == "label" and node.attrs.get("for"):
+            labels_by_id.setdefault(node.attrs["for"], node.raw_text.strip())
+
+    fields = []
+    for node in nodes:
+        if node.tag in ("input", "textarea"):
+            attrs = dict(node.attrs)
+            attrs["label"] = labels_by_id.get(attrs.get("id"), "")
+            fields.append(attrs)
+    return fields
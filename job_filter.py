@@ -35,13 +35,14 @@ def get_translated_job_data(job_data):
     job_translation_cache[job_id] = translated_data
     return translated_data
 
-def is_relevant_job(job_data, user_profile):
+def is_relevant_job(job_data, user_profile, score=None):
     """
     Determines if a job is relevant to the user profile using a scoring function.
 
     Args:
         job_data (dict): Job information (title, description, requirements).
         user_profile (dict): User profile containing at least 'name' and 'skills'.
+        score (float, optional): Precomputed relevance score; skips re-scoring when given.
 
     Returns:
         bool: True if the job is relevant, False otherwise.
@@ -59,6 +60,9 @@ def is_relevant_job(job_data, user_profile):
         print(f"[SKIP] Incomplete job data for job ID: {job_data.get('job_id', 'N/A')}")
         return False
 
+    if score is not None:
+        return score >= RELEVANCE_THRESHOLD
+
     # Score relevance
     score = score_job_relevance(title, description, requirements, user_profile)
     print(f"[RELEVANCE SCORE] Job ID {job_data.get('job_id', 'N/A')}: {score:.2f}")
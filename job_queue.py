@@ -0,0 +1,151 @@
+import json
+import sqlite3
+import time
+
+QUEUE_FILE = "job_queue.db"
+VISIBILITY_TIMEOUT = 600  # seconds a claimed job stays hidden from other workers
+MAX_ATTEMPTS = 3
+
+
+class JobQueue:
+    """
+    Durable local job queue on SQLite with lease/ack semantics.
+
+    A claimed job is leased to one worker until it is acked, failed, or its lease expires,
+    after which another worker can claim it again (e.g. when the first worker crashed).
+    Jobs are keyed by their Shufti id, so pushing the same listing twice is a no-op.
+    The same database holds the applied-jobs record shared by all workers.
+    """
+
+    def __init__(self, queue_file=QUEUE_FILE, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        # Autocommit mode so claim() can take the write lock explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(queue_file, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                enqueued_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, enqueued_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS applied (id TEXT PRIMARY KEY, applied_at REAL NOT NULL)")
+
+    def push(self, job):
+        """
+        Enqueues a job dict; returns False if a job with the same id was already queued.
+        """
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (id, payload, enqueued_at, updated_at) VALUES (?, ?, ?, ?)",
+            (job["id"], json.dumps(job, ensure_ascii=False), now, now)
+        )
+        return cursor.rowcount == 1
+
+    def known_ids(self):
+        return {row[0] for row in self.conn.execute("SELECT id FROM jobs")}
+
+    def claim(self, worker_id):
+        """
+        Leases the oldest pending (or lease-expired) job to a worker.
+
+        Returns:
+            dict: The job, or None if there is nothing to claim.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that have used up their attempts become dead-letter entries
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = self.conn.execute(
+                "SELECT id, payload FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY enqueued_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.visibility_timeout, now, row[0])
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return json.loads(row[1]) if row else None
+
+    def ack(self, job_id, worker_id):
+        """
+        Marks a leased job as done. Returns False if the lease had already moved to another worker.
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Releases a leased job for retry, or marks it failed once it has used up its attempts.
+        """
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (self.max_attempts, str(error), time.time(), job_id, worker_id)
+        )
+
+    def mark_applied(self, job_id):
+        """
+        Records a job as applied; returns False if it was already recorded.
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO applied (id, applied_at) VALUES (?, ?)", (job_id, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def unmark_applied(self, job_id):
+        """
+        Releases an application reserved with mark_applied() that was never sent.
+        """
+        self.conn.execute("DELETE FROM applied WHERE id = ?", (job_id,))
+
+    def extend_lease(self, job_id, worker_id):
+        """
+        Pushes a held lease's expiry out by another visibility timeout. Returns False if the lease was lost.
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + self.visibility_timeout, time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def is_applied(self, job_id):
+        return self.conn.execute("SELECT 1 FROM applied WHERE id = ?", (job_id,)).fetchone() is not None
+
+    def applied_ids(self):
+        return {row[0] for row in self.conn.execute("SELECT id FROM applied")}
+
+    def stats(self):
+        """
+        Returns the number of jobs per status.
+        """
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def close(self):
+        self.conn.close()
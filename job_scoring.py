@@ -38,15 +38,32 @@ tokenizer = T5Tokenizer.from_pretrained(SCORING_MODEL)
 model = T5ForConditionalGeneration.from_pretrained(SCORING_MODEL)
 
 
+def translate_job(title, description, requirements):
+    """
+    Translates a job's title, description and requirements to English.
+    """
+    return {
+        "title": translate_to_english(title),
+        "description": translate_to_english(description),
+        "requirements": translate_to_english(requirements)
+    }
+
+
 def score_job_relevance(title, description, requirements, user_profile):
     """
     Computes a relevance score (0–10) between a job and a user profile.
     Uses a translation model to translate job details from Japanese to English before scoring.
     """
-    title_en = translate_to_english(title)
-    description_en = translate_to_english(description)
-    requirements_en = translate_to_english(requirements)
+    translated = translate_job(title, description, requirements)
+    return score_translated_job(
+        translated["title"], translated["description"], translated["requirements"], user_profile
+    )
+
 
+def score_translated_job(title_en, description_en, requirements_en, user_profile):
+    """
+    Computes a relevance score (0–10) for job details that are already in English.
+    """
     profile_text = (
         f"My name is {user_profile.get('name', 'Anonymous')}. "
         f"I have experience in {', '.join(user_profile.get('skills', []))}. "
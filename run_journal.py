@@ -0,0 +1,114 @@
+import json
+import os
+
+# One journal per role and profile, so runs for different profiles or entry points never share a file
+JOURNAL_FILE = "run_journal.{run_key}.jsonl"
+DAEMON_JOURNAL_FILE = "run_journal.daemon.{run_key}.jsonl"
+COORDINATOR_JOURNAL_FILE = "run_journal.coordinator.{run_key}.jsonl"
+
+# Pipeline stages in order; a job resumes after the last one it reached.
+STAGES = ["discovered", "fetched", "translated", "scored", "applied", "skipped"]
+TERMINAL_STAGES = {"applied", "skipped"}
+
+
+class RunJournal:
+    """
+    Append-only JSON-lines journal of each job's progress through the pipeline.
+
+    Every line holds a job id, the stage it reached and only that stage's new outputs,
+    so a crashed run can be resumed from the last completed stage per job.
+    The first line records the run_key (account/profile) the journal was written for;
+    a file written for a different run_key is left untouched and this journal stays in memory.
+    journal_file may contain a {run_key} placeholder; with journal_file=None the journal is kept in memory only.
+    """
+
+    def __init__(self, journal_file=None, run_key=None):
+        self.journal_file = journal_file.format(run_key=run_key) if journal_file else None
+        self.run_key = run_key
+        self.jobs = {}
+        self._needs_newline = False
+        self._has_header = False
+        self._load()
+
+    def _load(self):
+        if self.journal_file is None:
+            return
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                header = f.readline()
+                try:
+                    stored_key = json.loads(header).get("run_key")
+                except (json.JSONDecodeError, AttributeError):
+                    stored_key = None
+                if stored_key != self.run_key:
+                    print(f"[JOURNAL] {self.journal_file} belongs to a different profile; "
+                          f"keeping this run's journal in memory only.")
+                    self.journal_file = None
+                    return
+                self._has_header = True
+                self._needs_newline = not header.endswith("\n")
+
+                for line in f:
+                    self._needs_newline = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a truncated last line behind
+                        continue
+                    self._apply(entry)
+        except FileNotFoundError:
+            pass
+
+        if self.jobs:
+            print(f"[JOURNAL] Resuming {len(self.jobs)} jobs from {self.journal_file}.")
+
+    def _apply(self, entry):
+        job = self.jobs.setdefault(entry.pop("id"), {})
+        job.update(entry)
+
+    def record(self, job_id, stage, **outputs):
+        """
+        Records that a job completed a stage, along with that stage's outputs.
+        """
+        entry = {"id": job_id, "stage": stage, **outputs}
+        if self.journal_file is None:
+            self._apply(entry)
+            return
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            if not self._has_header:
+                f.write(json.dumps({"run_key": self.run_key}) + "\n")
+                self._has_header = True
+            if self._needs_newline:
+                f.write("\n")
+                self._needs_newline = False
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(entry)
+
+    def get(self, job_id):
+        return self.jobs.get(job_id, {})
+
+    def reached(self, job_id, stage):
+        """
+        Returns True if the job has completed the given stage (or any later one).
+        """
+        current = self.get(job_id).get("stage")
+        return current is not None and STAGES.index(current) >= STAGES.index(stage)
+
+    def is_done(self, job_id):
+        return self.get(job_id).get("stage") in TERMINAL_STAGES
+
+    def clear(self):
+        """
+        Discards the journal once a run has finished completely.
+        """
+        self.jobs = {}
+        self._needs_newline = False
+        self._has_header = False
+        if self.journal_file is None:
+            return
+        try:
+            os.remove(self.journal_file)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,24 @@
 import asyncio
+import hashlib
+import json
+import logging
+import os
+from urllib.parse import urlparse
 import torch
 from transformers import T5ForConditionalGeneration, T5Tokenizer
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-from job_scoring import score_job_relevance
+from job_scoring import translate_job, score_translated_job
+from html_extractor import extract_job_links, extract_job_details
+from run_journal import RunJournal, JOURNAL_FILE
+from user_profile import profile_key
 
 # ====== Constants ======
 BASE_URL = "https://app.shufti.jp/jobs/search"
 LOGIN_URL = "https://app.shufti.jp/login"
+MYPAGE_URL = "https://app.shufti.jp/mypage"
+MYPAGE_PATH = "/mypage"
+# Saved cookies/localStorage, one file per account
+STORAGE_STATE_FILE = "shufti_storage_state.{account}.json"
 MODEL_NAME = "google/flan-t5-small"
 
 # ====== Load model once globally ======
@@ -20,12 +31,13 @@ class MessagingAgent:
         self.user_name = user_name
         self.user_profile = user_profile or {}
 
-    def send_message(self, job_id, job_title, job_description, job_requirements):
-        if not self.user_profile:
+    def send_message(self, job_id, job_title, job_description, job_requirements, message=None):
+        if not self.user_profile and message is None:
             print(f"[INFO] Sending default message for Job {job_id}: {job_title} (from {self.user_name})")
             return True
 
-        message = self.generate_application_message(job_title, job_description, job_requirements)
+        # Callers that already generated the message pass it in to skip a second generation
+        message = message or self.generate_application_message(job_title, job_description, job_requirements)
         print(f"[INFO] Sending message for Job {job_id}: {message} (from {self.user_name})")
         return True
 
@@ -53,13 +65,35 @@ Job Requirements: {requirements}
 
         return tokenizer.decode(output_ids[0], skip_special_tokens=True).strip()
 
+class LoginError(Exception):
+    """Raised when logging in to Shufti does not land on the user's mypage."""
+
+
+def is_mypage_url(url):
+    """
+    True only when the URL path itself is mypage, so a redirect like /login?next=%2Fmypage does not count.
+    """
+    path = urlparse(url).path.rstrip("/")
+    return path == MYPAGE_PATH or path.startswith(MYPAGE_PATH + "/")
+
+
+def storage_state_file_for(email):
+    """
+    Returns the storage state path for an account, keyed by a hash of its email.
+    """
+    account = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return STORAGE_STATE_FILE.format(account=account)
+
+
 # ====== Job Scraper Class ======
 class JobScraper:
-    def __init__(self, email, password, max_pages=2, delay=5):
+    def __init__(self, email, password, max_pages=2, delay=5, storage_state_file=None, journal=None):
         self.email = email
         self.password = password
         self.max_pages = max_pages
         self.delay = delay
+        self.storage_state_file = storage_state_file or storage_state_file_for(email)
+        self.journal = journal or RunJournal(None)
 
     async def login(self, page):
         try:
@@ -73,71 +107,199 @@ class JobScraper:
 
             await page.click("#submit")
             await page.wait_for_load_state("load", timeout=10000)
-
-            if "mypage" in page.url:
-                print("[LOGIN SUCCESSFUL] Redirecting to job search...")
-            else:
-                print("[LOGIN FAILED] Could not find the expected page.")
         except Exception as e:
-            print(f"[LOGIN ERROR] {e}")
+            raise LoginError(f"Login request failed: {e}") from e
 
-    async def crawl_jobs(self, user_profile):
-        jobs = []
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        if not is_mypage_url(page.url):
+            raise LoginError(f"Could not find the expected page after login (landed on {page.url}).")
+        print("[LOGIN SUCCESSFUL] Redirecting to job search...")
 
+    async def is_logged_in(self, page):
+        """
+        Cheap authenticated probe: an expired session gets redirected away from mypage.
+        """
+        try:
+            await page.goto(MYPAGE_URL, wait_until="domcontentloaded", timeout=15000)
+        except Exception as e:
+            print(f"[SESSION CHECK ERROR] {e}")
+            return False
+        return is_mypage_url(page.url)
+
+    async def save_storage_state(self, context):
+        """
+        Writes the context's session cookies/localStorage to the account's state file, readable by the owner only.
+        """
+        state = await context.storage_state()
+        # Write to a temp file and swap it in so a crash mid-write never leaves a truncated state file
+        tmp_file = f"{self.storage_state_file}.tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        if os.name != "nt":
+            # O_CREAT leaves the mode of a pre-existing temp file unchanged; Windows has no POSIX modes
+            os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, self.storage_state_file)
+
+    async def restore_session(self, browser):
+        """
+        Opens a context from the saved storage state and returns (context, page) if it is still logged in,
+        or None when the state is missing, unreadable or expired.
+        """
+        if not os.path.exists(self.storage_state_file):
+            return None
+
+        context = None
+        try:
+            with open(self.storage_state_file, "r") as f:
+                state = json.load(f)
+            context = await browser.new_context(storage_state=state)
+            page = await context.new_page()
+            if await self.is_logged_in(page):
+                return context, page
+            print("[SESSION EXPIRED] Logging in again...")
+        except Exception as e:
+            print(f"[SESSION RESTORE ERROR] {e}; logging in again...")
+
+        if context is not None:
+            await context.close()
+        return None
+
+    async def open_session(self, browser):
+        """
+        Returns a logged-in (context, page) pair.
+        Reuses the saved storage state (cookies/localStorage) when it is still valid
+        and only falls back to a full login when it is missing or expired.
+        """
+        restored = await self.restore_session(browser)
+        if restored:
+            print("[SESSION RESTORED] Reusing saved login session.")
+            return restored
+
+        context = await browser.new_context()
+        page = await context.new_page()
+        try:
             await self.login(page)
+        except LoginError:
+            await context.close()
+            raise
+        await self.save_storage_state(context)
+        return context, page
+
+    async def open_browser(self, playwright):
+        """
+        Launches Chromium and returns a logged-in (browser, context, page) for long-running loops.
+        """
+        browser = await playwright.chromium.launch(headless=True)
+        try:
+            context, page = await self.open_session(browser)
+        except Exception:
+            await self.close_browser(browser, None)
+            raise
+        return browser, context, page
+
+    async def close_browser(self, browser, context):
+        """
+        Closes a context and browser that may already be dead, ignoring errors.
+        """
+        for closable in (context, browser):
+            if closable is None:
+                continue
+            try:
+                await closable.close()
+            except Exception as e:
+                logging.debug(f"Ignoring error while closing browser: {e}")
+
+    async def ensure_logged_in(self, context, page):
+        """
+        Re-validates a long-lived session and logs in again (saving fresh storage state) if it expired.
+        """
+        if await self.is_logged_in(page):
+            return
+        print("[SESSION EXPIRED] Logging in again...")
+        await self.login(page)
+        await self.save_storage_state(context)
+
+    async def build_job(self, page, job_id, job_url, user_profile, score=True):
+        """
+        Runs one listing through the fetch, translate and score stages,
+        skipping every stage the run journal already has outputs for.
+        With score=False it stops after fetching, leaving translation and scoring to a worker.
+        """
+        journal = self.journal
+        if not journal.reached(job_id, "discovered"):
+            journal.record(job_id, "discovered", link=job_url)
+
+        if not journal.reached(job_id, "fetched"):
+            await page.goto(job_url, timeout=30000)
+            await asyncio.sleep(3)
+            journal.record(job_id, "fetched", **extract_job_details(await page.content()))
+
+        # The journal updates this dict in place as later stages are recorded
+        entry = journal.get(job_id)
+        job = {
+            "id": job_id,
+            "title": entry["title"],
+            "description": entry["description"],
+            "requirements": entry["requirements"],
+            "link": entry["link"]
+        }
+        if not score:
+            return job
 
-            for page_num in range(1, self.max_pages + 1):
-                await page.goto(f"{BASE_URL}?page={page_num}", timeout=30000)
-                await asyncio.sleep(self.delay)
+        if not journal.reached(job_id, "translated"):
+            translated = translate_job(entry["title"], entry["description"], entry["requirements"])
+            journal.record(job_id, "translated", translated=translated)
 
-                soup = BeautifulSoup(await page.content(), "html.parser", from_encoding="utf-8")
-                job_cards = soup.find_all("a", class_="job-info-full-link")
+        if not journal.reached(job_id, "scored"):
+            translated = entry["translated"]
+            score = score_translated_job(
+                translated["title"], translated["description"], translated["requirements"], user_profile
+            )
+            journal.record(job_id, "scored", score=score)
 
-                for card in job_cards:
-                    job_url = "https://app.shufti.jp" + card['href']
-                    await page.goto(job_url, timeout=30000)
-                    await asyncio.sleep(3)
+        print(f"[SCORE: {entry['score']:.2f}] {entry['title']}")
+        job["score"] = entry["score"]
+        return job
 
-                    job_soup = BeautifulSoup(await page.content(), "html.parser", from_encoding="utf-8")
-                    title = job_soup.find("h1")
-                    description = job_soup.find("div", class_="job-description")
-                    requirements = job_soup.find("div", class_="job-requirements")
+    async def fetch_jobs(self, page, user_profile, skip_ids=(), score=True):
+        """
+        Crawls the search result pages with an already logged-in page.
+        Listings whose id is in skip_ids, or which the journal already marks applied/skipped, are left out.
+        """
+        jobs = []
 
-                    title_text = title.get_text(strip=True) if title else "No Title Found"
-                    description_text = description.get_text(strip=True) if description else "No Description Found"
-                    requirements_text = requirements.get_text(strip=True) if requirements else "No Requirements Found"
+        for page_num in range(1, self.max_pages + 1):
+            await page.goto(f"{BASE_URL}?page={page_num}", timeout=30000)
+            await asyncio.sleep(self.delay)
 
-                    title_text = title_text.encode('utf-8').decode('utf-8')
-                    description_text = description_text.encode('utf-8').decode('utf-8')
-                    requirements_text = requirements_text.encode('utf-8').decode('utf-8')
+            job_links = extract_job_links(await page.content())
 
-                    job = {
-                        "id": job_url.split("/")[-1],
-                        "title": title_text,
-                        "description": description_text,
-                        "requirements": requirements_text,
-                        "link": job_url
-                    }
+            for href in job_links:
+                job_url = "https://app.shufti.jp" + href
+                job_id = job_url.split("/")[-1]
+                if job_id in skip_ids or self.journal.is_done(job_id):
+                    continue
 
-                    score = score_job_relevance(
-                        job["title"], job["description"], job["requirements"], user_profile
-                    )
+                jobs.append(await self.build_job(page, job_id, job_url, user_profile, score=score))
 
-                    print(f"[SCORE: {score:.2f}] {job['title']}")
-                    jobs.append(job)
+            await asyncio.sleep(self.delay)
+
+        return jobs
+
+    async def crawl_jobs(self, user_profile):
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context, page = await self.open_session(browser)
 
-                await asyncio.sleep(self.delay)
+            jobs = await self.fetch_jobs(page, user_profile)
 
+            await context.close()
             await browser.close()
         return jobs
 
 # ====== Shufti Session Wrapper ======
 class ShuftiSession:
-    def __init__(self, email, password, user_name="Your AI Agent", user_profile=None):
+    def __init__(self, email, password, user_name="Your AI Agent", user_profile=None, journal_file=JOURNAL_FILE):
         user_profile = user_profile or {
             "name": user_name,
             "email": email,
@@ -146,7 +308,8 @@ class ShuftiSession:
         }
 
         self.user_profile = user_profile
-        self.scraper = JobScraper(email, password)
+        self.journal = RunJournal(journal_file, run_key=profile_key(user_profile))
+        self.scraper = JobScraper(email, password, journal=self.journal)
         self.messaging_agent = MessagingAgent(user_name, user_profile)
 
     async def process_jobs(self):
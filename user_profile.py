@@ -1,3 +1,7 @@
+import hashlib
+import json
+
+
 def get_user_profile(email, name, skills, bio):
     """
     Returns a user profile based on the provided inputs from the GUI.
@@ -17,3 +21,18 @@ def get_user_profile(email, name, skills, bio):
         "skills": skills,
         "bio": bio  # Now passing the bio from GUI input
     }
+
+
+def profile_key(user_profile):
+    """
+    Returns a short stable hash of a user profile (including its email),
+    used to tell whether saved run state belongs to the same account and profile.
+
+    Args:
+        user_profile (dict): User profile data.
+
+    Returns:
+        str: Hex digest identifying the profile.
+    """
+    data = json.dumps(user_profile, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]